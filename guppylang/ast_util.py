@@ -1,8 +1,8 @@
 import ast
 import textwrap
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar, cast
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, Optional, TypeVar, cast
 
 if TYPE_CHECKING:
     from guppylang.tys.ty import Type
@@ -46,11 +46,26 @@ class AstVisitor(Generic[T]):
     allows modifications.
     """
 
+    #: Cache of the visitor functions for each node type. Saves us from doing a
+    #: string-based `getattr` lookup for every visited node. Every subclass gets its
+    #: own cache, see `__init_subclass__`.
+    _visitors: ClassVar[dict[type, Callable[..., Any]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._visitors = {}
+
     def visit(self, node: Any, *args: Any, **kwargs: Any) -> T:
         """Visit a node."""
-        method = "visit_" + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node, *args, **kwargs)
+        cls = self.__class__
+        visitor: Callable[..., T]
+        try:
+            visitor = cls._visitors[node.__class__]
+        except KeyError:
+            method = "visit_" + node.__class__.__name__
+            visitor = getattr(cls, method, cls.generic_visit)
+            cls._visitors[node.__class__] = visitor
+        return visitor(self, node, *args, **kwargs)
 
     def generic_visit(self, node: Any, *args: Any, **kwargs: Any) -> T:
         """Called if no explicit visitor function exists for a node."""
@@ -94,15 +109,54 @@ def find_nodes(
     return v.found
 
 
-def name_nodes_in_ast(node: Any) -> list[ast.Name]:
-    """Returns all `Name` nodes occurring in an AST."""
-    found = find_nodes(lambda n: isinstance(n, ast.Name), node)
-    return cast(list[ast.Name], found)
+def find_stmts(
+    matcher: Callable[[ast.AST], bool],
+    node: ast.AST,
+    dont_recurse_into: set[type[ast.AST]] | None = None,
+) -> list[ast.AST]:
+    """Returns all statements in the AST that satisfy the matcher.
+
+    Behaves like `find_nodes`, but doesn't descend into expressions since those can't
+    contain statements.
+    """
+    dont_recurse_into = dont_recurse_into or set()
+    found = [node] if matcher(node) else []
+    stack = [ast.iter_child_nodes(node)]
+    while stack:
+        for n in stack[-1]:
+            if isinstance(n, ast.expr):
+                continue
+            if matcher(n):
+                found.append(n)
+            if type(n) not in dont_recurse_into:
+                stack.append(ast.iter_child_nodes(n))
+            break
+        else:
+            stack.pop()
+    return found
+
+
+def name_nodes_in_ast(node: Any) -> Iterator[ast.Name]:
+    """Returns an iterator over all `Name` nodes occurring in an AST.
+
+    The nodes are yielded in the same depth-first order as `find_nodes` would return
+    them, but without building an intermediate list.
+    """
+    stack = [iter((node,))]
+    while stack:
+        for n in stack[-1]:
+            if isinstance(n, ast.Name):
+                yield n
+            else:
+                stack.append(ast.iter_child_nodes(n))
+            break
+        else:
+            stack.pop()
 
 
 def return_nodes_in_ast(node: Any) -> list[ast.Return]:
     """Returns all `Return` nodes occurring in an AST."""
-    found = find_nodes(lambda n: isinstance(n, ast.Return), node, {ast.FunctionDef})
+    found = find_stmts(lambda n: isinstance(n, ast.Return), node, {ast.FunctionDef})
     return cast(list[ast.Return], found)
 
 
@@ -111,7 +165,7 @@ def breaks_in_loop(node: Any) -> list[ast.Break]:
 
     Note that breaks in nested loops are excluded.
     """
-    found = find_nodes(
+    found = find_stmts(
         lambda n: isinstance(n, ast.Break), node, {ast.For, ast.While, ast.FunctionDef}
     )
     return cast(list[ast.Break], found)
@@ -236,18 +290,12 @@ def set_location_from(node: ast.AST, loc: ast.AST) -> None:
 def annotate_location(
     node: ast.AST, source: str, file: str, line_offset: int, recurse: bool = True
 ) -> None:
-    node.line_offset = line_offset  # type: ignore[attr-defined]
-    node.file = file  # type: ignore[attr-defined]
-    node.source = source  # type: ignore[attr-defined]
-
-    if recurse:
-        for _field, value in ast.iter_fields(node):
-            if isinstance(value, list):
-                for item in value:
-                    if isinstance(item, ast.AST):
-                        annotate_location(item, source, file, line_offset, recurse)
-            elif isinstance(value, ast.AST):
-                annotate_location(value, source, file, line_offset, recurse)
+    # `ast.walk` visits the same child nodes as a recursive traversal over the fields
+    # would, but avoids a Python call per node
+    for n in ast.walk(node) if recurse else (node,):
+        n.line_offset = line_offset  # type: ignore[attr-defined]
+        n.file = file  # type: ignore[attr-defined]
+        n.source = source  # type: ignore[attr-defined]
 
 
 def shift_loc(node: ast.AST, delta_lineno: int, delta_col_offset: int) -> None:
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Iterable
 from typing import Generic, TypeVar
 
@@ -11,6 +12,34 @@ T = TypeVar("T")
 Result = dict[BB, T]
 
 
+def reverse_postorder(bbs: Iterable[BB]) -> list[BB]:
+    """Returns the given BBs in reverse postorder.
+
+    The depth-first traversal starts at the first BB (usually the entry of the CFG).
+    BBs that are not reachable from there are used as additional roots in the order in
+    which they are given.
+    """
+    postorder: list[BB] = []
+    visited: set[BB] = set()
+    for root in bbs:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(root.successors))]
+        while stack:
+            bb, succs = stack[-1]
+            for succ in succs:
+                if succ not in visited:
+                    visited.add(succ)
+                    stack.append((succ, iter(succ.successors)))
+                    break
+            else:
+                stack.pop()
+                postorder.append(bb)
+    postorder.reverse()
+    return postorder
+
+
 class Analysis(Generic[T], ABC):
     """Abstract base class for a program analysis pass over the lattice `T`"""
 
@@ -20,7 +49,11 @@ class Analysis(Generic[T], ABC):
 
     @abstractmethod
     def initial(self) -> T:
-        """Initial lattice value"""
+        """Initial lattice value
+
+        Note that lattice values are never mutated by the analysis drivers, so the
+        initial value may be shared between multiple BBs.
+        """
 
     @abstractmethod
     def join(self, *ts: T) -> T:
@@ -46,16 +79,24 @@ class ForwardAnalysis(Generic[T], Analysis[T], ABC):
 
         Returns a mapping from basic blocks to lattice values at the start of each BB.
         """
-        vals_before = {bb: self.initial() for bb in bbs}  # return value
+        bbs = reverse_postorder(bbs)
+        vals_before = dict.fromkeys(bbs, self.initial())  # return value
         vals_after = {bb: self.apply_bb(vals_before[bb], bb) for bb in bbs}  # cache
-        queue = set(bbs)
+        # Visiting BBs in reverse postorder ensures that we see all predecessors of a BB
+        # before the BB itself (except for back edges).
+        queue = deque(bbs)
+        in_queue = set(bbs)
         while len(queue) > 0:
-            bb = queue.pop()
+            bb = queue.popleft()
+            in_queue.remove(bb)
             vals_before[bb] = self.join(*(vals_after[pred] for pred in bb.predecessors))
             val_after = self.apply_bb(vals_before[bb], bb)
             if not self.eq(val_after, vals_after[bb]):
                 vals_after[bb] = val_after
-                queue.update(bb.successors)
+                for succ in bb.successors:
+                    if succ not in in_queue:
+                        in_queue.add(succ)
+                        queue.append(succ)
         return vals_before
 
 
@@ -71,15 +112,27 @@ class BackwardAnalysis(Generic[T], Analysis[T], ABC):
 
         Returns a mapping from basic blocks to lattice values at the start of each BB.
         """
+        bbs = reverse_postorder(bbs)
         vals_before = {bb: self.initial() for bb in bbs}
-        queue = set(bbs)
+        # Visiting BBs in postorder ensures that we see all successors of a BB before
+        # the BB itself (except for back edges). We keep track of which BBs are already
+        # enqueued to avoid processing the same BB multiple times in a row.
+        queue = deque(reversed(bbs))
+        in_queue = set(bbs)
         while len(queue) > 0:
-            bb = queue.pop()
+            bb = queue.popleft()
+            in_queue.remove(bb)
             val_after = self.join(*(vals_before[succ] for succ in bb.successors))
             val_before = self.apply_bb(val_after, bb)
+            # Predecessors only need to be revisited if the value at the start of this
+            # BB actually changed. Changes to the value at the end of the BB that are
+            # absorbed by `apply_bb` don't propagate any further.
             if not self.eq(vals_before[bb], val_before):
                 vals_before[bb] = val_before
-                queue.update(bb.predecessors)
+                for pred in bb.predecessors:
+                    if pred not in in_queue:
+                        in_queue.add(pred)
+                        queue.append(pred)
         return vals_before
 
 
@@ -97,8 +150,12 @@ class LivenessAnalysis(Generic[VId], BackwardAnalysis[LivenessDomain[VId]]):
 
     stats: dict[BB, VariableStats[VId]]
 
+    #: Variables used in each BB, mapped to the BB itself as evidence
+    used: dict[BB, LivenessDomain[VId]]
+
     def __init__(self, stats: dict[BB, VariableStats[VId]]) -> None:
         self.stats = stats
+        self.used = {bb: dict.fromkeys(stat.used, bb) for bb, stat in stats.items()}
 
     def eq(self, live1: LivenessDomain[VId], live2: LivenessDomain[VId]) -> bool:
         # Only check that both contain the same variables. We don't care about the BB
@@ -109,16 +166,24 @@ class LivenessAnalysis(Generic[VId], BackwardAnalysis[LivenessDomain[VId]]):
         return {}
 
     def join(self, *ts: LivenessDomain[VId]) -> LivenessDomain[VId]:
+        # Most BBs only have a single successor. Since lattice values are never mutated,
+        # we can return its value without copying
+        if len(ts) == 1:
+            return ts[0]
         res: LivenessDomain[VId] = {}
         for t in ts:
             res |= t
         return res
 
     def apply_bb(self, live_after: LivenessDomain[VId], bb: BB) -> LivenessDomain[VId]:
-        stats = self.stats[bb]
-        return {x: bb for x in stats.used} | {
-            x: b for x, b in live_after.items() if x not in stats.assigned
-        }
+        assigned = self.stats[bb].assigned
+        # Build the result in place instead of merging two intermediate dicts. Note
+        # that evidence from `live_after` takes precedence over uses in this BB.
+        live_before = self.used[bb].copy()
+        for x, b in live_after.items():
+            if x not in assigned:
+                live_before[x] = b
+        return live_before
 
 
 # Set of variables that are definitely assigned at the start of a BB
@@ -128,22 +193,34 @@ DefAssignmentDomain = set[VId]
 # assigned variables are a subset of this
 MaybeAssignmentDomain = set[VId]
 
-# For assignment analysis, we do definite- and maybe-assignment in one pass
-AssignmentDomain = tuple[DefAssignmentDomain[VId], MaybeAssignmentDomain[VId]]
+# For assignment analysis, we do definite- and maybe-assignment in one pass. Internally,
+# both sets are encoded as bitmasks (see `AssignmentAnalysis`).
+AssignmentDomain = tuple[int, int]
 
 
-class AssignmentAnalysis(Generic[VId], ForwardAnalysis[AssignmentDomain[VId]]):
+class AssignmentAnalysis(Generic[VId], ForwardAnalysis[AssignmentDomain]):
     """Assigned variable analysis pass.
 
     Computes the set of variables (i.e. `V`s) that are definitely assigned at the start
     of a BB. Additionally, we compute the set of variables that are assigned on (at
     least) some paths to a BB (the definitely assigned variables are a subset of this).
+
+    To keep the fixpoint computation cheap, each variable is given a bit index and sets
+    of variables are represented as integer bitmasks. Use `run_unpacked` to obtain the
+    results as sets of variables.
     """
 
     stats: dict[BB, VariableStats[VId]]
-    all_vars: set[VId]
-    ass_before_entry: set[VId]
-    maybe_ass_before_entry: set[VId]
+    all_vars: int
+    ass_before_entry: int
+    maybe_ass_before_entry: int
+
+    #: Bitmask of the variables assigned in each BB
+    assigned: dict[BB, int]
+
+    #: Bit indices of the variables occurring in the analysis and the reverse mapping
+    var_bits: dict[VId, int]
+    vars: list[VId]
 
     def __init__(
         self,
@@ -158,41 +235,66 @@ class AssignmentAnalysis(Generic[VId], ForwardAnalysis[AssignmentDomain[VId]]):
         """
         assert ass_before_entry.issubset(maybe_ass_before_entry)
         self.stats = stats
-        self.ass_before_entry = ass_before_entry
-        self.maybe_ass_before_entry = maybe_ass_before_entry
-        self.all_vars = (
-            set.union(*(set(stat.assigned.keys()) for stat in stats.values()))
-            | ass_before_entry
-        )
-
-    def initial(self) -> AssignmentDomain[VId]:
+        self.var_bits = {}
+        self.vars = []
+        self.ass_before_entry = self.to_mask(ass_before_entry)
+        self.maybe_ass_before_entry = self.to_mask(maybe_ass_before_entry)
+        self.assigned = {bb: self.to_mask(stat.assigned) for bb, stat in stats.items()}
+        self.all_vars = self.ass_before_entry
+        for mask in self.assigned.values():
+            self.all_vars |= mask
+
+    def to_mask(self, xs: Iterable[VId]) -> int:
+        """Encodes a collection of variables as a bitmask.
+
+        Variables that haven't been seen before are assigned a fresh bit index.
+        """
+        mask = 0
+        for x in xs:
+            bit = self.var_bits.get(x)
+            if bit is None:
+                bit = self.var_bits[x] = len(self.vars)
+                self.vars.append(x)
+            mask |= 1 << bit
+        return mask
+
+    def from_mask(self, mask: int) -> set[VId]:
+        """Decodes a bitmask into the set of variables it represents."""
+        xs = set()
+        while mask:
+            lowest = mask & -mask
+            xs.add(self.vars[lowest.bit_length() - 1])
+            mask ^= lowest
+        return xs
+
+    def initial(self) -> AssignmentDomain:
         # Note that definite assignment must start with `all_vars` instead of only
         # `ass_before_entry` since we want to compute the *greatest* fixpoint.
         return self.all_vars, self.maybe_ass_before_entry
 
-    def join(self, *ts: AssignmentDomain[VId]) -> AssignmentDomain[VId]:
+    def join(self, *ts: AssignmentDomain) -> AssignmentDomain:
         # We always include the variables that are definitely assigned before the entry,
         # even if the join is empty
         if len(ts) == 0:
             return self.ass_before_entry, self.ass_before_entry
 
-        def_ass = set.intersection(*(def_ass for def_ass, _ in ts))
-        maybe_ass = set.union(*(maybe_ass for _, maybe_ass in ts))
+        def_ass, maybe_ass = ts[0]
+        for def_ass_t, maybe_ass_t in ts[1:]:
+            def_ass &= def_ass_t
+            maybe_ass |= maybe_ass_t
         return def_ass, maybe_ass
 
-    def apply_bb(
-        self, val_before: AssignmentDomain[VId], bb: BB
-    ) -> AssignmentDomain[VId]:
-        stats = self.stats[bb]
+    def apply_bb(self, val_before: AssignmentDomain, bb: BB) -> AssignmentDomain:
+        assigned = self.assigned[bb]
         def_ass_before, maybe_ass_before = val_before
-        return (
-            def_ass_before | stats.assigned.keys(),
-            maybe_ass_before | stats.assigned.keys(),
-        )
+        return def_ass_before | assigned, maybe_ass_before | assigned
 
     def run_unpacked(
         self, bbs: Iterable[BB]
     ) -> tuple[Result[DefAssignmentDomain[VId]], Result[MaybeAssignmentDomain[VId]]]:
         """Runs the analysis and unpacks the definite- and maybe-assignment results."""
         res = self.run(bbs)
-        return {bb: res[bb][0] for bb in res}, {bb: res[bb][1] for bb in res}
+        return (
+            {bb: self.from_mask(def_ass) for bb, (def_ass, _) in res.items()},
+            {bb: self.from_mask(maybe_ass) for bb, (_, maybe_ass) in res.items()},
+        )
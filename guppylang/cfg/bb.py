@@ -114,14 +114,20 @@ class VariableVisitor(ast.NodeVisitor):
         This method should be called whenever an expression is used in the BB.
         """
         for name in name_nodes_in_ast(node):
-            # Should point to first use, so also check that the name is not already
-            # contained
-            x = name.id
-            if x not in self.stats.assigned and x not in self.stats.used:
-                self.stats.used[x] = name
+            self._update_used_name(name)
+
+    def _update_used_name(self, name: ast.Name) -> None:
+        """Marks a single variable as used."""
+        # Should point to first use, so also check that the name is not already
+        # contained
+        x = name.id
+        if x not in self.stats.assigned and x not in self.stats.used:
+            self.stats.used[x] = name
 
     def visit_Name(self, node: ast.Name) -> None:
-        self._update_used(node)
+        # No need to search for names inside the node, so we can skip the AST walk
+        # done by `_update_used`
+        self._update_used_name(node)
 
     def visit_Assign(self, node: ast.Assign) -> None:
         self.visit(node.value)
@@ -83,7 +83,6 @@ class CFGBuilder(AstVisitor[BB | None]):
             if not returns_none:
                 raise GuppyError(ExpectedError(nodes[-1], "return statement"))
             self.cfg.link(final_bb, self.cfg.exit_bb)
-
         return self.cfg
 
     def visit_stmts(self, nodes: list[ast.stmt], bb: BB, jumps: Jumps) -> BB | None:
@@ -92,7 +91,9 @@ class CFGBuilder(AstVisitor[BB | None]):
         for node in nodes:
             if bb_opt is None:
                 raise GuppyError(UnreachableError(node))
-            if is_functional_annotation(node):
+            # Only expression statements can be pseudo-decorators, so we can skip the
+            # call for all other statements
+            if isinstance(node, ast.Expr) and is_functional_annotation(node):
                 next_functional = True
                 continue
 
@@ -283,6 +284,20 @@ class ExprBuilder(ast.NodeTransformer):
     def visit_Name(self, node: ast.Name) -> ast.Name:
         return node
 
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant:
+        return node
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.BinOp:
+        # Frequent expressions like this one are handled directly instead of going
+        # through the generic field introspection of the node transformer
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.Attribute:
+        node.value = self.visit(node.value)
+        return node
+
     def visit_NamedExpr(self, node: ast.NamedExpr) -> ast.Name:
         # This is an assignment expression, e.g. `x := 42`. We turn it into an
         # assignment statement and replace the expression with `x`.
@@ -369,29 +384,20 @@ class BranchBuilder(AstVisitor[None]):
         builder.visit(node, bb, true_bb, false_bb)
 
     def visit_BoolOp(self, node: ast.BoolOp, bb: BB, true_bb: BB, false_bb: BB) -> None:
-        # Add short-circuit evaluation of boolean expression. If there are more than 2
-        # operators, we turn the flat operator list into a right-nested tree to allow
-        # for recursive processing.
+        # Add short-circuit evaluation of boolean expression. Each operand except the
+        # last one gets evaluated in its own BB and may short-circuit to `true_bb` or
+        # `false_bb`. Otherwise, we continue with the next operand.
         assert len(node.values) > 1
-        if len(node.values) > 2:
-            r = ast.BoolOp(
-                op=node.op,
-                values=node.values[1:],
-                lineno=node.values[0].lineno,
-                col_offset=node.values[0].col_offset,
-                end_lineno=node.values[-1].end_lineno,
-                end_col_offset=node.values[-1].end_col_offset,
-            )
-            node.values = [node.values[0], r]
-        [left, right] = node.values
-
-        extra_bb = self.cfg.new_bb()
         assert type(node.op) in [ast.And, ast.Or]
-        if isinstance(node.op, ast.And):
-            self.visit(left, bb, extra_bb, false_bb)
-        elif isinstance(node.op, ast.Or):
-            self.visit(left, bb, true_bb, extra_bb)
-        self.visit(right, extra_bb, true_bb, false_bb)
+        *init, last = node.values
+        for value in init:
+            extra_bb = self.cfg.new_bb()
+            if isinstance(node.op, ast.And):
+                self.visit(value, bb, extra_bb, false_bb)
+            elif isinstance(node.op, ast.Or):
+                self.visit(value, bb, true_bb, extra_bb)
+            bb = extra_bb
+        self.visit(last, bb, true_bb, false_bb)
 
     def visit_UnaryOp(
         self, node: ast.UnaryOp, bb: BB, true_bb: BB, false_bb: BB
@@ -6,9 +6,9 @@ Operates on CFGs produced by the `CFGBuilder`. Produces a `CheckedCFG` consistin
 
 import ast
 import collections
-from collections.abc import Iterator, Sequence
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import ClassVar, Generic, TypeVar
+from typing import ClassVar, Generic
 
 from guppylang.ast_util import line_col
 from guppylang.cfg.bb import BB
@@ -24,7 +24,7 @@ from guppylang.tys.ty import InputFlags, Type
 Row = Sequence[V]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Signature(Generic[V]):
     """The signature of a basic block.
 
@@ -89,39 +89,31 @@ def check_cfg(
     # Visit all control-flow edges in BFS order. We can't just do a normal loop over
     # all BBs since the input types for a BB are computed by checking a predecessor.
     # We do BFS instead of DFS to get a better error ordering.
-    queue = collections.deque(
-        (checked_cfg.entry_bb, i, succ)
-        # We enumerate the successor starting from the back, so we start with the `True`
-        # branch. This way, we find errors in a more natural order
-        for i, succ in reverse_enumerate(cfg.entry_bb.successors)
-    )
+    queue: collections.deque[tuple[CheckedBB[Variable], int, BB]] = collections.deque()
+    enqueue_successors(queue, checked_cfg.entry_bb, cfg.entry_bb)
     while len(queue) > 0:
         pred, num_output, bb = queue.popleft()
-        input_row = [
-            Variable(v.name, v.ty, v.defined_at, v.flags)
-            for v in pred.sig.output_rows[num_output]
-        ]
+        output_row = pred.sig.output_rows[num_output]
 
-        if bb in compiled:
+        checked_bb = compiled.get(bb)
+        if checked_bb is not None:
             # If the BB was already compiled, we just have to check that the signatures
-            # match.
-            check_rows_match(input_row, compiled[bb].sig.input_row, bb)
+            # match. This only reads the rows, so there is no need to copy the variables
+            check_rows_match(output_row, checked_bb.sig.input_row, bb)
         else:
             # Otherwise, check the BB and enqueue its successors
+            input_row = [
+                Variable(v.name, v.ty, v.defined_at, v.flags) for v in output_row
+            ]
             checked_bb = check_bb(
                 bb, checked_cfg, input_row, return_ty, generic_params, globals
             )
-            queue += [
-                # We enumerate the successor starting from the back, so we start with
-                # the `True` branch. This way, we find errors in a more natural order
-                (checked_bb, i, succ)
-                for i, succ in reverse_enumerate(bb.successors)
-            ]
+            enqueue_successors(queue, checked_bb, bb)
             compiled[bb] = checked_bb
 
         # Link up BBs in the checked CFG
-        compiled[bb].predecessors.append(pred)
-        pred.successors[num_output] = compiled[bb]
+        checked_bb.predecessors.append(pred)
+        pred.successors[num_output] = checked_bb
 
     checked_cfg.bbs = list(compiled.values())
     checked_cfg.exit_bb = compiled[cfg.exit_bb]  # TODO: Fails if exit is unreachable
@@ -205,10 +197,18 @@ def check_bb(
         bb.branch_pred, ty = ExprSynthesizer(ctx).synthesize(bb.branch_pred)
         bb.branch_pred, _ = to_bool(bb.branch_pred, ty, ctx)
 
+    # Next, we compute the signature of the basic block: For each successor, we output
+    # the variables that are live at its start. The variables in scope don't change
+    # anymore, so we can hoist them out of the loops.
+    local_vars, global_names = ctx.locals, ctx.globals.names
+    outputs: list[Row[Variable]] = []
     for succ in bb.successors:
+        output_row: list[Variable] = []
         for x, use_bb in cfg.live_before[succ].items():
+            if (var := local_vars.get(x)) is not None:
+                output_row.append(var)
             # Check that the variables requested by the successor are defined
-            if x not in ctx.locals and x not in ctx.globals:
+            elif x not in global_names:
                 # If the variable is defined on *some* paths, we can give a more
                 # informative error message
                 if x in cfg.maybe_ass_before[use_bb]:
@@ -221,12 +221,7 @@ def check_bb(
                         err.add_sub_diagnostic(note)
                     raise GuppyError(err)
                 raise GuppyError(VarNotDefinedError(use_bb.vars.used[x], x))
-
-    # Finally, we need to compute the signature of the basic block
-    outputs = [
-        [ctx.locals[x] for x in cfg.live_before[succ] if x in ctx.locals]
-        for succ in bb.successors
-    ]
+        outputs.append(output_row)
 
     # Also prepare the successor list so we can fill it in later
     checked_bb = CheckedBB(
@@ -243,6 +238,14 @@ def check_rows_match(row1: Row[Variable], row2: Row[Variable], bb: BB) -> None:
     Otherwise, an error is thrown, alerting the user that a variable has different
     types on different control-flow paths.
     """
+    # Both rows are usually computed from the same liveness result and thus list the
+    # variables in the same order. In that case, we can compare them pairwise. Rows are
+    # copied along control-flow edges, so we can often compare the types by identity.
+    if len(row1) == len(row2) and all(
+        v1.name == v2.name and (v1.ty is v2.ty or v1.ty == v2.ty)
+        for v1, v2 in zip(row1, row2, strict=True)
+    ):
+        return
     map1, map2 = {v.name: v for v in row1}, {v.name: v for v in row2}
     assert map1.keys() == map2.keys()
     for x in map1:
@@ -294,14 +297,15 @@ def diagnose_maybe_undefined(
     return None
 
 
-T = TypeVar("T")
-
-
-def reverse_enumerate(xs: list[T]) -> Iterator[tuple[int, T]]:
-    """Enumerates a list in reverse order.
-
-    Equivalent to `reversed(list(enumerate(data)))` without creating an intermediate
-    list.
-    """
-    for i in range(len(xs) - 1, -1, -1):
-        yield i, xs[i]
+def enqueue_successors(
+    queue: collections.deque[tuple[CheckedBB[Variable], int, BB]],
+    checked_bb: CheckedBB[Variable],
+    bb: BB,
+) -> None:
+    """Adds the outgoing edges of a BB to the queue of edges that are still to be
+    checked."""
+    # We enumerate the successor starting from the back, so we start with the `True`
+    # branch. This way, we find errors in a more natural order
+    succs = bb.successors
+    for i in range(len(succs) - 1, -1, -1):
+        queue.append((checked_bb, i, succs[i]))
@@ -289,9 +289,12 @@ class Globals:
         return None
 
     def with_python_scope(self, python_scope: PyScope) -> "Globals":
-        return Globals(
-            self.defs, self.names, self.impls, self.python_scope | python_scope
-        )
+        # Python scopes are never mutated, so we can avoid copying the (potentially
+        # large) scope if there is nothing to merge. This is the common case since
+        # module-level globals don't carry a Python scope.
+        if self.python_scope:
+            python_scope = self.python_scope | python_scope
+        return Globals(self.defs, self.names, self.impls, python_scope)
 
     def __or__(self, other: "Globals") -> "Globals":
         impls = {
@@ -348,6 +351,19 @@ class Locals(Generic[VId, V]):
     def __setitem__(self, key: VId, value: V) -> None:
         self.vars[key] = value
 
+    def get(self, item: VId) -> V | None:
+        """Looks up a variable, returning `None` if it is not in scope.
+
+        Compared to a membership test followed by an index, this only walks the scope
+        chain once.
+        """
+        scope: Locals[VId, V] | None = self
+        while scope is not None:
+            if item in scope.vars:
+                return scope.vars[item]
+            scope = scope.parent_scope
+        return None
+
     def __iter__(self) -> Iterator[VId]:
         parent_iter = iter(self.parent_scope) if self.parent_scope else iter(())
         return itertools.chain(iter(self.vars), parent_iter)
@@ -387,8 +387,7 @@ class ExprSynthesizer(AstVisitor[tuple[ast.expr, Type]]):
 
     def visit_Name(self, node: ast.Name) -> tuple[ast.expr, Type]:
         x = node.id
-        if x in self.ctx.locals:
-            var = self.ctx.locals[x]
+        if (var := self.ctx.locals.get(x)) is not None:
             return with_loc(node, PlaceNode(place=var)), var.ty
         elif x in self.ctx.generic_params:
             param = self.ctx.generic_params[x]
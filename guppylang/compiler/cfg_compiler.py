@@ -1,4 +1,3 @@
-import functools
 from collections.abc import Sequence
 
 from hugr import Wire, ops
@@ -44,9 +43,11 @@ def compile_cfg(
     blocks: dict[CheckedBB[Place], ToNode] = {}
     for bb in cfg.bbs:
         blocks[bb] = compile_bb(bb, builder, bb == cfg.entry_bb, globals)
+    # Only add the control-flow edges once all blocks exist
     for bb in cfg.bbs:
+        block = blocks[bb]
         for i, succ in enumerate(bb.successors):
-            builder.branch(blocks[bb][i], blocks[succ])
+            builder.branch(block[i], blocks[succ])
 
     return builder
 
@@ -104,7 +105,8 @@ def compile_bb(
         # If we branch and the branches use the same places, then we can use a
         # regular output
         first, *rest = bb.sig.output_rows
-        if all({p.id for p in first} == {p.id for p in r} for r in rest):
+        first_ids = {p.id for p in first}
+        if all(first_ids == {p.id for p in r} for r in rest):
             outputs = first
         else:
             # Otherwise, we have to output a TupleSum: We put all non-linear variables
@@ -179,14 +181,14 @@ def choose_vars_for_tuple_sum(
         return conditional
 
 
-def compare_var(p1: Place, p2: Place) -> int:
-    """Defines a `<` order on variables.
+def var_sort_key(p: Place) -> tuple[bool, str]:
+    """Returns the `(linear, name)` key by which variables are sorted.
 
     We use this to determine in which order variables are outputted from basic blocks.
-    We need to output linear variables at the end, so we do a lexicographic ordering of
-    linearity and name.
+    We need to output linear variables at the end, so the key orders by linearity first
+    and by name second.
     """
-    return -1 if (p1.ty.linear, str(p1)) < (p2.ty.linear, str(p2)) else 1
+    return p.ty.linear, str(p)
 
 
 def sort_vars(row: Row[Place]) -> list[Place]:
@@ -194,4 +196,4 @@ def sort_vars(row: Row[Place]) -> list[Place]:
 
     This determines the order in which they are outputted from a BB.
     """
-    return sorted(row, key=functools.cmp_to_key(compare_var))
+    return sorted(row, key=var_sort_key)
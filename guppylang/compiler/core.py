@@ -1,3 +1,4 @@
+import functools
 from abc import ABC
 from dataclasses import dataclass, field
 from typing import cast
@@ -161,13 +162,16 @@ class CompilerBase(ABC):
         self.globals = globals
 
 
+@functools.cache
 def return_var(n: int) -> str:
     """Name of the dummy variable for the n-th return value of a function.
 
     During compilation, we treat return statements like assignments of dummy variables.
     For example, the statement `return e0, e1, e2` is treated like `%ret0 = e0 ; %ret1 =
     e1 ; %ret2 = e2`. This way, we can reuse our existing mechanism for passing of live
-    variables between basic blocks."""
+    variables between basic blocks.
+
+    The names are cached since they are requested for every return statement."""
     return f"%ret{n}"
 
 
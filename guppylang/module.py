@@ -289,7 +289,14 @@ class GuppyModule:
             else defn
             for def_id, defn in raw_defs.items()
         }
-        parsed_globals = globals | Globals(dict(parsed), {}, {}, {})
+        # Only the definitions change between the two phases, so we can reuse the
+        # merged names and impls instead of merging with `globals` again
+        parsed_globals = Globals(
+            {**globals.defs, **parsed},
+            raw_globals.names,
+            raw_globals.impls,
+            raw_globals.python_scope,
+        )
         return {
             def_id: (
                 defn.check(parsed_globals) if isinstance(defn, CheckableDef) else defn
@@ -414,7 +421,11 @@ def get_py_scope(f: PyFunc) -> PyScope:
                 continue
             nonlocals[var] = value
 
-    return frame_vars | nonlocals | f.__globals__.copy()
+    # `frame_vars` is a fresh dict, so we can merge the remaining scopes in place
+    # instead of allocating intermediate copies
+    frame_vars |= nonlocals
+    frame_vars |= f.__globals__
+    return frame_vars
 
 
 def find_guppy_module_in_py_module(module: ModuleType) -> GuppyModule:
@@ -132,14 +132,26 @@ class SourceMap:
 
     sources: dict[str, SourceLines]
 
+    #: The raw `linecache` lines from which the entries in `sources` were created
+    _cached_lines: dict[str, SourceLines]
+
     def __init__(self) -> None:
         self.sources = {}
+        self._cached_lines = {}
 
     def add_file(self, file: str, content: str | None = None) -> None:
         """Registers a new source file."""
         if content is None:
-            self.sources[file] = [line.rstrip() for line in linecache.getlines(file)]
+            # Files are registered once for every definition they contain. `linecache`
+            # hands out the same list until the file changes, so we only need to
+            # process the lines again if we get a new one.
+            lines = linecache.getlines(file)
+            if self._cached_lines.get(file) is lines:
+                return
+            self._cached_lines[file] = lines
+            self.sources[file] = [line.rstrip() for line in lines]
         else:
+            self._cached_lines.pop(file, None)
             self.sources[file] = content.splitlines(keepends=False)
 
     def span_lines(self, span: Span, prefix_lines: int = 0) -> list[str]:
@@ -1,3 +1,4 @@
+import functools
 from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Literal, TypeGuard
@@ -208,22 +209,32 @@ sized_iter_type_def = OpaqueTypeDef(
 )
 
 
+# Types are immutable, so the constructors for primitive types below can hand out a
+# shared instance. This avoids repeated allocations and lets equality checks
+# succeed on identity.
+
+
+@functools.cache
 def bool_type() -> OpaqueType:
     return OpaqueType([], bool_type_def)
 
 
+@functools.cache
 def nat_type() -> NumericType:
     return NumericType(NumericType.Kind.Nat)
 
 
+@functools.cache
 def int_type() -> NumericType:
     return NumericType(NumericType.Kind.Int)
 
 
+@functools.cache
 def float_type() -> NumericType:
     return NumericType(NumericType.Kind.Float)
 
 
+@functools.cache
 def string_type() -> OpaqueType:
     return OpaqueType([], string_type_def)
 
@@ -0,0 +1,14 @@
+from tests.util import compile_guppy
+
+
+@compile_guppy
+def foo(x: int) -> int:
+
+    def bar() -> int:
+        y = x
+        x = 1
+        while (x := 2) > 0:
+            return y
+        return y
+
+    return bar()
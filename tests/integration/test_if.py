@@ -298,3 +298,17 @@ def test_one_as_bool(validate):
             return False
 
     validate(foo)
+
+
+def test_if_bool_op_chain(validate):
+    @compile_guppy
+    def foo(a: bool, b: bool, c: bool, d: bool) -> int:
+        if a and b and c and d:
+            return 1
+        if a or b or c or d:
+            return 2
+        if a and (b or c or d) and not c:
+            return 3
+        return 4
+
+    validate(foo)